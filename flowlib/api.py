@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import copy
 import io
 import os
 import shutil
@@ -59,7 +58,7 @@ def new_flow_from_deployment(deployment_json, validate=True):
     :raises: FlowLibException
     """
     deployment = FlowDeployment.from_dict(json.load(deployment_json))
-    flow = Flow(copy.deepcopy(deployment.flow), **deployment.flow)
+    flow = Flow(deployment.flow, **deployment.flow)
     flow.flowlib_version = flowlib.__version__
     flow.initialize(with_components=deployment.components)
     if validate:
@@ -85,7 +84,7 @@ def new_flow_from_yaml(flow_yaml, component_dir=None, validate=True):
     else:
         component_dir = os.path.abspath(os.path.join(os.path.dirname(flow_yaml.name), 'components'))
 
-    flow = Flow(copy.deepcopy(raw), **raw)
+    flow = Flow(raw, **raw)
     flow.flowlib_version = flowlib.__version__
     flow.initialize(component_dir=component_dir)
     if validate:
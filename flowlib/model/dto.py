@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from nipyapi.nifi.models.processor_config_dto import ProcessorConfigDTO
+from nipyapi.nifi.models.controller_service_dto import ControllerServiceDTO
+from nipyapi.nifi.models.reporting_task_dto import ReportingTaskDTO
+from nipyapi.nifi.models.remote_process_group_dto import RemoteProcessGroupDTO
+
+
+class RemoteProcessGroupConfig(RemoteProcessGroupDTO):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+
+class ProcessorConfig(ProcessorConfigDTO):
+    def __init__(self, package_id, **kwargs):
+        super().__init__(**kwargs)
+        self.package_id = package_id
+
+    def __repr__(self):
+        return str(vars(self))
+
+
+class ControllerServiceConfig(ControllerServiceDTO):
+    def __init__(self, package_id, **kwargs):
+        super().__init__(**kwargs)
+        self.package_id = package_id
+
+    def __repr__(self):
+        return str(vars(self))
+
+
+class ReportingTaskConfig(ReportingTaskDTO):
+    def __init__(self, package_id, **kwargs):
+        super().__init__(**kwargs)
+        self.package_id = package_id
+
+    def __repr__(self):
+        return str(vars(self))
@@ -1,22 +1,68 @@
 # -*- coding: utf-8 -*-
+import functools
+import operator
+import pickle
+import sys
+import zlib
 from abc import ABC
 
 from flowlib.logger import log
 from flowlib.exceptions import FlowLibException, FlowValidationException
 
-from nipyapi.nifi.models.processor_config_dto import ProcessorConfigDTO
-from nipyapi.nifi.models.controller_service_dto import ControllerServiceDTO
-from nipyapi.nifi.models.reporting_task_dto import ReportingTaskDTO
-from nipyapi.nifi.models.remote_process_group_dto import RemoteProcessGroupDTO
+
+def __getattr__(name):
+    # The nipyapi backed config classes live in flowlib.model.dto so that importing the flow model
+    # does not import nipyapi until a config is built. Resolve them lazily for existing imports
+    if name in ('ProcessorConfig', 'ControllerServiceConfig', 'ReportingTaskConfig', 'RemoteProcessGroupConfig'):
+        import flowlib.model.dto
+        return getattr(flowlib.model.dto, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls):
+    """
+    The __slots__ of a class and all of its parent classes, base classes first
+    """
+    return tuple(s for c in reversed(cls.__mro__) for s in getattr(c, '__slots__', ()))
+
+
+def _slots_repr(obj):
+    """
+    The equivalent of str(vars(obj)) for instances of classes which define __slots__
+    """
+    return str({s: getattr(obj, s) for s in _slot_names(type(obj))})
+
+
+def _write_once(attr):
+    """
+    A property for attributes which may not be changed once they are set, e.g. the NiFi uuids assigned during deployment.
+    The value is stored in the instance attribute attr. Reads use operator.attrgetter so they do not run a Python
+    function, only assignments go through the readonly check
+    :param attr: The name of the instance attribute which stores the value
+    :type attr: str
+    """
+    def setter(self, value):
+        if getattr(self, attr) is not None:
+            raise FlowLibException("Attempted to change readonly attribute after initialization")
+        setattr(self, attr, value)
+
+    return property(operator.attrgetter(attr), setter)
 
 
 class Flow:
 
     PG_NAME_DELIMETER = '/'
 
+    __slots__ = ('_raw', 'name', 'canvas', 'flowlib_version', 'version', 'comments', 'controller_services', 'global_vars',
+        '_is_initialized', '_is_valid', '_controllers', '_controllers_by_name', '_loaded_components', '_elements', '_path_index', '_id')
+
+    id = _write_once('_id')
+
     def __init__(self, raw, name=None, canvas=None, flowlib_version=None, version=None, controller_services=None, comments=None, global_vars=None, components=None):
         """
-        :param raw: The raw dictionary value of the Flow converted from yaml
+        :param raw: The raw dictionary value of the Flow converted from yaml. It is kept compressed for the
+          lifetime of the Flow and each access of flow.raw returns a new copy, so callers do not need to copy it
         :type raw: dict
         :param name: The name of the Flow
         :type name: str
@@ -37,14 +83,19 @@ class Flow:
         :attr _elements: A map of elements defining the flow logic, may be deeply nested if the FlowElement is a ProcessGroup itself.
           Initialized by calling flow.initialize()
         :type _elements: dict(str:FlowElement)
-        :attr _controllers: Whether this flow has been been initialized (elements and components loaded)
+        :attr _path_index: A flat map of the full canvas path of each ProcessGroup (e.g flow-name/group-name) to the ProcessGroup,
+          populated while initializing the flow so that parent lookups do not need to walk the nested _elements
+        :type _path_index: dict(str:ProcessGroup)
+        :attr _controllers: The controller services of the flow, set while initializing the flow
         :type _controllers: list(ControllerService)
+        :attr _controllers_by_name: A map of controller names to the controller services of the flow
+        :type _controllers_by_name: dict(str:ControllerService)
         :attr _is_initialized: Whether this flow has been been initialized (elements and components loaded)
         :type _is_initialized: bool
         :attr _is_valid: Whether this flow has been been validated (elements and connections)
         :type _is_valid: bool
         """
-        self.raw = raw
+        self._raw = zlib.compress(pickle.dumps(raw, protocol=pickle.HIGHEST_PROTOCOL))
         self.name = name
         self.canvas = canvas
         self.flowlib_version = flowlib_version
@@ -55,8 +106,10 @@ class Flow:
         self._is_initialized = False
         self._is_valid = False
         self._controllers = None
+        self._controllers_by_name = dict()
         self._loaded_components = dict()
         self._elements = dict()
+        self._path_index = dict()
         self._id = None
 
     @property
@@ -70,14 +123,20 @@ class Flow:
         self._loaded_components = components
 
     @property
-    def id(self):
-        return self._id
+    def raw(self):
+        return pickle.loads(zlib.decompress(self._raw))
+
+    @property
+    def controllers(self):
+        return self._controllers
 
-    @id.setter
-    def id(self, _id):
-        if self._id:
+    @controllers.setter
+    def controllers(self, controllers):
+        if self._controllers is not None:
             raise FlowLibException("Attempted to change readonly attribute after initialization")
-        self._id = _id
+        # controller names are already checked for uniqueness by parser.init_controllers()
+        self._controllers = controllers
+        self._controllers_by_name = {c.name: c for c in controllers}
 
 
     def initialize(self, component_dir=None, with_components=None):
@@ -121,13 +180,7 @@ class Flow:
         :param name: The name of the controller
         :type name: str
         """
-        if self._controllers:
-            filtered = list(filter(lambda c: c.name == name, self._controllers))
-            if len(filtered) > 1:
-                raise FlowLibException("Found multiple controllers named {}".format(name))
-            if len(filtered) == 1:
-                return filtered[0]
-        return None
+        return self._controllers_by_name.get(name)
 
     def get_parent_element(self, element):
         """
@@ -136,19 +189,40 @@ class Flow:
         :type element: FlowElement
         """
         if isinstance(element, FlowElement):
-            target = self
-            names = element.parent_path.split(Flow.PG_NAME_DELIMETER)
-            for n in names[1:]:
-                target = target._elements.get(n)
-            return target
+            if element.parent_path == self.name:
+                return self
+            parent = self._path_index.get(element.parent_path)
+            if parent is None:
+                raise FlowLibException("No ProcessGroup has been loaded at path {} for element {}".format(element.parent_path, element.name))
+            return parent
         elif isinstance(element, Flow):
             return None
         else:
             raise FlowLibException("Flow.get_parent_element() requires an element which is a subclass of FlowElement")
 
 
+    def _index_element(self, element):
+        """
+        Register a ProcessGroup by its full canvas path so that get_parent_element() can resolve
+        the children of the ProcessGroup with a single lookup
+        :param element: The ProcessGroup to index
+        :type element: ProcessGroup
+        :return: The full canvas path of the ProcessGroup, which is the parent_path of its children
+        """
+        path = "{}{}{}".format(element.parent_path, Flow.PG_NAME_DELIMETER, element.name)
+        self._path_index[path] = element
+        return path
+
     def __repr__(self):
-        return str(vars(self))
+        # show the decoded raw definition rather than its compressed bytes
+        attrs = {s: getattr(self, s) for s in _slot_names(type(self)) if s != '_raw'}
+        return str({'raw': self.raw, **attrs})
+
+_ERR_NO_TYPE = "FlowElement.from_dict() requires a dict with a 'type' field, one of ['processor', 'process_group', 'remote_process_group', 'input_port', 'output_port']"
+_ERR_EMPTY_NAME = "Element names may not be empty. Found invalid element with parent path: {}"
+_ERR_INVALID_NAME = "Invalid element: '{}'. Element names may not contain '{}' characters"
+_ERR_INVALID_TYPE = "Element 'type' field must be one of ['processor', 'process_group', 'remote_process_group', 'input_port', 'output_port']"
+
 
 class FlowElement(ABC):
     """
@@ -169,61 +243,58 @@ class FlowElement(ABC):
     :param connections: A list of Connections defining this Elements connections to other Elements
     :type connections: list(Connection)
     """
+    __slots__ = ('_id', '_parent_id', '_parent_path', 'src_component_name', '_type', 'name', 'connections')
+
+    id = _write_once('_id')
+    parent_id = _write_once('_parent_id')
+
     def __init__(self, **kwargs):
         self._id = kwargs.get('_id')
         self._parent_id = kwargs.get('_parent_id')
         self._parent_path = kwargs.get('_parent_path')
-        self._src_component_name = kwargs.get('_src_component_name')
+        self.src_component_name = kwargs.get('_src_component_name')
         self._type = kwargs.get('_type')
         self.name = kwargs.get('name')
-        self.connections = [Connection(**c) for c in kwargs.get('connections')] if kwargs.get('connections') else []
+        connections = kwargs.get('connections')
+        self.connections = [Connection(**c) for c in connections] if connections else []
 
     @staticmethod
     def from_dict(elem_dict):
-        if not isinstance(elem_dict, dict) or not elem_dict.get('type'):
-            raise FlowLibException("FlowElement.from_dict() requires a dict with a 'type' field, one of ['processor', 'process_group', 'input_port', 'output_port']")
-
-        name = elem_dict.get('name')
-        if not name or len(name) < 1:
-            raise FlowLibException("Element names may not be empty. Found invalid element with parent path: {}".format(elem_dict.get('parent_path')))
-        if Flow.PG_NAME_DELIMETER in name:
-            raise FlowLibException("Invalid element: '{}'. Element names may not contain '{}' characters".format(name, Flow.PG_NAME_DELIMETER))
-
-        elem_dict['_type'] = elem_dict.pop('type')
-        if elem_dict['_type'] == 'process_group':
-            if elem_dict.get('vars'):
-                elem_dict['_vars'] = elem_dict.pop('vars')
-            return ProcessGroup(**elem_dict)
-        elif elem_dict['_type'] == 'remote_process_group':
-            return RemoteProcessGroup(**elem_dict)
-        elif elem_dict['_type'] == 'processor':
-            return Processor(**elem_dict)
-        elif elem_dict['_type'] == 'input_port':
-            return InputPort(**elem_dict)
-        elif elem_dict['_type'] == 'output_port':
-            return OutputPort(**elem_dict)
-        else:
-            raise FlowLibException("Element 'type' field must be one of ['processor', 'process_group', 'remote_process_group', 'input_port', 'output_port']")
+        FlowElement.validate_many((elem_dict,))
+        return FlowElement.from_validated_dict(elem_dict)
 
-    @property
-    def id(self):
-        return self._id
+    @staticmethod
+    def validate_many(elem_dicts):
+        """
+        Check the type and name of each element definition before any of them are constructed
+        :param elem_dicts: The element definitions to validate
+        :type elem_dicts: list(dict)
+        :raises: FlowLibException
+        """
+        for elem_dict in elem_dicts:
+            if not isinstance(elem_dict, dict) or not (_type := elem_dict.get('type')):
+                raise FlowLibException(_ERR_NO_TYPE)
 
-    @id.setter
-    def id(self, _id):
-        if self._id:
-            raise FlowLibException("Attempted to change readonly attribute after initialization")
-        self._id = _id
+            name = elem_dict.get('name')
+            if not name:
+                raise FlowLibException(_ERR_EMPTY_NAME.format(elem_dict.get('_parent_path')))
+            if Flow.PG_NAME_DELIMETER in name:
+                raise FlowLibException(_ERR_INVALID_NAME.format(name, Flow.PG_NAME_DELIMETER))
 
-    @property
-    def parent_id(self):
-        return self._parent_id
+            if not isinstance(_type, str) or _type not in _ELEMENT_TYPES:
+                raise FlowLibException(_ERR_INVALID_TYPE)
 
-    @parent_id.setter
-    def parent_id(self, _id):
-        if self._parent_id:
-            raise FlowLibException("Attempted to change readonly attribute after initialization")
-        self._parent_id = _id
+    @staticmethod
+    def from_validated_dict(elem_dict):
+        """
+        Construct a FlowElement from a definition which has already been checked by FlowElement.validate_many()
+        :param elem_dict: The element definition
+        :type elem_dict: dict
+        """
+        _type = elem_dict.pop('type')
+        # intern the type so every element shares the same string as the _ELEMENT_TYPES keys
+        elem_dict['_type'] = sys.intern(_type)
+        return _ELEMENT_TYPES[_type](**elem_dict)
 
     @property
     def parent_path(self):
@@ -240,21 +311,21 @@ class FlowElement(ABC):
         return self._type
 
     def __repr__(self):
-        return str(vars(self))
+        return _slots_repr(self)
 
 
 class RemoteProcessGroup(FlowElement):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.config = RemoteProcessGroupConfig(**kwargs['config'])
+    __slots__ = ('config',)
 
-
-class RemoteProcessGroupConfig(RemoteProcessGroupDTO):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        from flowlib.model.dto import RemoteProcessGroupConfig
+        self.config = RemoteProcessGroupConfig(**kwargs['config'])
 
 
 class ProcessGroup(FlowElement):
+    __slots__ = ('component_path', 'controllers', 'vars', '_elements')
+
     def __init__(self, **kwargs):
         """
         Represents the instantiation of a flowlib Component
@@ -270,12 +341,14 @@ class ProcessGroup(FlowElement):
         """
         super().__init__(**kwargs)
         self.component_path = kwargs.get('component_path')
-        self.controllers = kwargs.get('controllers', dict())
-        self.vars = kwargs.get('_vars', dict())
+        self.controllers = kwargs.get('controllers') or dict()
+        self.vars = kwargs.get('vars') or dict()
         self._elements = dict()
 
 
 class Processor(FlowElement):
+    __slots__ = ('config',)
+
     def __init__(self, **kwargs):
         """
         Represents a processor element within a process group
@@ -285,31 +358,39 @@ class Processor(FlowElement):
         super().__init__(**kwargs)
         if not kwargs.get('config', {}).get('package_id'):
             raise FlowLibException("Invalid processor definition. config.package_id is a required field")
-        if not 'properties' in kwargs.get('config', {}):
-            kwargs['config']['properties'] = dict()
+        from flowlib.model.dto import ProcessorConfig
         self.config = ProcessorConfig(kwargs['config'].pop('package_id'), **kwargs['config'])
 
 
-class ProcessorConfig(ProcessorConfigDTO):
-    def __init__(self, package_id, **kwargs):
-        super().__init__(**kwargs)
-        self.package_id = package_id
-
-    def __repr__(self):
-        return str(vars(self))
-
-
 class InputPort(FlowElement):
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
 
 class OutputPort(FlowElement):
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
 
+# Maps the 'type' field of an element definition to the FlowElement subclass which implements it.
+# Any type specific handling of the definition belongs in the subclass constructor so from_dict() stays a single lookup
+_ELEMENT_TYPES = {
+    'process_group': ProcessGroup,
+    'remote_process_group': RemoteProcessGroup,
+    'processor': Processor,
+    'input_port': InputPort,
+    'output_port': OutputPort
+}
+
+
 class Connection:
+    __slots__ = ('name', 'from_port', 'to_port', 'relationships', 'back_pressure_object_threshold', 'back_pressure_data_size_threshold',
+        'flow_file_expiration', 'load_balance_strategy', 'prioritizers', 'load_balance_compression')
+
     def __init__(self, name, from_port=None, to_port=None, relationships=None, back_pressure_object_threshold=None, back_pressure_data_size_threshold=None, flow_file_expiration=None, load_balance_strategy=None, prioritizers=None, load_balance_compression=None):
         self.name = name
         self.from_port = from_port
@@ -323,79 +404,38 @@ class Connection:
         self.load_balance_compression = load_balance_compression
 
     def __repr__(self):
-        return str(vars(self))
+        return _slots_repr(self)
 
 
 class ControllerService:
+    __slots__ = ('_id', '_parent_id', 'name', 'config')
+
+    id = _write_once('_id')
+    parent_id = _write_once('_parent_id')
+
     def __init__(self, name, config):
         self._id = None
         self._parent_id = None
         self.name = name
 
-        if not 'properties' in config:
-            config['properties'] = dict()
+        from flowlib.model.dto import ControllerServiceConfig
         self.config = ControllerServiceConfig(config.pop('package_id'), **config)
 
-    @property
-    def id(self):
-        return self._id
-
-    @id.setter
-    def id(self, _id):
-        if self._id:
-            raise FlowLibException("Attempted to change readonly attribute after initialization")
-        self._id = _id
-
-    @property
-    def parent_id(self):
-        return self._parent_id
-
-    @parent_id.setter
-    def parent_id(self, _id):
-        if self._parent_id:
-            raise FlowLibException("Attempted to change readonly attribute after initialization")
-        self._parent_id = _id
-
     def __repr__(self):
-        return str(vars(self))
-
+        return _slots_repr(self)
 
-class ControllerServiceConfig(ControllerServiceDTO):
-    def __init__(self, package_id, **kwargs):
-        super().__init__(**kwargs)
-        self.package_id = package_id
 
-    def __repr__(self):
-        return str(vars(self))
+class ReportingTask:
+    __slots__ = ('_id', 'name', 'config')
 
+    id = _write_once('_id')
 
-class ReportingTask:
     def __init__(self, name, config):
         self._id = None
         self.name = name
 
-        if not 'properties' in config:
-            config['properties'] = dict()
+        from flowlib.model.dto import ReportingTaskConfig
         self.config = ReportingTaskConfig(config.pop('package_id'), **config)
 
-    @property
-    def id(self):
-        return self._id
-
-    @id.setter
-    def id(self, _id):
-        if self._id:
-            raise FlowLibException("Attempted to change readonly attribute after initialization")
-        self._id = _id
-
-    def __repr__(self):
-        return str(vars(self))
-
-
-class ReportingTaskConfig(ReportingTaskDTO):
-    def __init__(self, package_id, **kwargs):
-        super().__init__(**kwargs)
-        self.package_id = package_id
-
     def __repr__(self):
-        return str(vars(self))
+        return _slots_repr(self)
@@ -104,12 +104,15 @@ def init_flow(flow, component_dir=None, with_components=None):
     env.globals.update(**flow.global_vars)
 
     # initialize and apply templating for the controller services
-    flow._controllers = init_controllers(flow.controller_services)
+    flow.controllers = init_controllers(flow.controller_services)
 
     log.info("Initializing root Flow {}".format(flow.name))
     for elem_dict in flow.canvas:
         elem_dict['_parent_path'] = flow.name
-        el = FlowElement.from_dict(copy.deepcopy(elem_dict))
+    FlowElement.validate_many(flow.canvas)
+
+    for elem_dict in flow.canvas:
+        el = FlowElement.from_validated_dict(copy.deepcopy(elem_dict))
         check_name(el.name)
         el.src_component_name = 'root'
 
@@ -195,10 +198,15 @@ def _init_component_recursive(pg_element, flow, component_dir=None):
             if not v in pg_element.vars:
                 raise FlowValidationException("Missing required_vars. {} is not provided but is required by {}".format(v, component.source_file))
 
-    # Call FlowElement.from_dict() on each element in the process_group
+    # Index the process group before loading its children so they can resolve it with flow.get_parent_element()
+    parent_path = flow._index_element(pg_element)
+    for elem_dict in component.process_group:
+        elem_dict['_parent_path'] = parent_path
+    FlowElement.validate_many(component.process_group)
+
+    # Construct each element in the process_group
     for elem_dict in component.process_group:
-        elem_dict['_parent_path'] = "{}{}{}".format(pg_element._parent_path, Flow.PG_NAME_DELIMETER, pg_element.name)
-        el = FlowElement.from_dict(copy.deepcopy(elem_dict))
+        el = FlowElement.from_validated_dict(copy.deepcopy(elem_dict))
         check_name(el.name)
         el.src_component_name = component.name
 
@@ -272,7 +280,11 @@ def _replace_vars(process_group, source_component):
             _template_properties(el, context)
 
 
-def _template_properties(el, context=dict()):
+def _template_properties(el, context=None):
+    # properties are left unset (None) when an element does not define any
+    if not el.config.properties:
+        return
+    context = context or dict()
     for k,v in el.config.properties.items():
         t = env.from_string(v)
         el.config.properties[k] = t.render(**context)
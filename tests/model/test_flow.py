@@ -18,6 +18,13 @@ class TestFlow(unittest.TestCase):
         flow.initialize(utils.COMPONENT_DIR)
         flow.validate()
 
+    def test_flow_repr(self):
+        flow = utils.load_test_flow()
+        r = repr(flow)
+        self.assertTrue(r.startswith("{{'raw': {}".format(flow.raw)))
+        self.assertNotIn('_raw', r)
+        self.assertNotIn(repr(flow._raw), r)
+
     def test_find_component_by_path(self):
         flow = utils.load_test_flow()
         real = 'test-component.yaml'
@@ -29,15 +36,19 @@ class TestFlow(unittest.TestCase):
         flow._loaded_components['duplicate'] = duplicate
         self.assertRaisesRegex(FlowLibException, '^Found multiple loaded components with source_file.*', flow.find_component_by_path, 'test-component.yaml')
 
-    def find_controller_by_name(self):
+    def test_find_controller_by_name(self):
         flow = utils.load_test_flow()
 
-        controller = flow.find_controller_by_name('aws-s3-credentials')
+        controller = flow.find_controller_by_name('test-controller-service')
         self.assertIsInstance(controller, ControllerService)
+        self.assertIsNone(flow.find_controller_by_name('not-real'))
+
+        self.assertRaisesRegex(FlowLibException, '^Attempted to change readonly attribute.*', setattr, flow, 'controllers', [controller])
 
-        flow._controllers.append(controller)
-        self.assertRaisesRegex(FlowLibException, '^Found multiple controllers named.*', flow.find_controller_by_name, 'aws-s3-credentials')
-        self.assertIsNone(flow.find_controller_by_name('not-real'), ControllerService)
+        # an empty list of controllers still counts as set
+        empty = utils.load_test_flow(init=False)
+        empty.controllers = []
+        self.assertRaisesRegex(FlowLibException, '^Attempted to change readonly attribute.*', setattr, empty, 'controllers', [controller])
 
     def test_get_parent_element(self):
         flow = utils.load_test_flow()
@@ -59,6 +70,14 @@ class TestFlow(unittest.TestCase):
                 # assert that the parent of each element is the correct group
                 self.assertEqual(g, flow.get_parent_element(e))
 
+        # elements whose parent path was never loaded are an error rather than a root element
+        unknown = FlowElement.from_dict({
+            'name': 'test-input-port',
+            'type': 'input_port',
+            '_parent_path': '{}{}not-loaded'.format(flow.name, Flow.PG_NAME_DELIMETER)
+        })
+        self.assertRaisesRegex(FlowLibException, "^No ProcessGroup has been loaded at path.*", flow.get_parent_element, unknown)
+
     def test_flow_element_from_dict(self):
         no_name = {
             'name': '',
@@ -75,6 +94,11 @@ class TestFlow(unittest.TestCase):
             'type': 'invalid-type'
         }
         self.assertRaisesRegex(FlowLibException, "^Element 'type' field must be one of .*", FlowElement.from_dict, invalid_type)
+        unhashable_type = {
+            'name': 'test',
+            'type': ['processor']
+        }
+        self.assertRaisesRegex(FlowLibException, "^Element 'type' field must be one of .*", FlowElement.from_dict, unhashable_type)
         missing_package_id = {
             'name': 'test-processor',
             'type': 'processor',
@@ -88,7 +112,9 @@ class TestFlow(unittest.TestCase):
                 'package_id': 'io.b23.package.id'
             }
         }
-        self.assertIsInstance(FlowElement.from_dict(processor), Processor)
+        processor = FlowElement.from_dict(processor)
+        self.assertIsInstance(processor, Processor)
+        self.assertIsNone(processor.config.properties)
         process_group = {
             'name': 'test-process-group',
             'type': 'process_group'
@@ -110,3 +136,35 @@ class TestFlow(unittest.TestCase):
             'config': {}
         }
         self.assertIsInstance(FlowElement.from_dict(output_port), RemoteProcessGroup)
+
+    def test_readonly_ids(self):
+        input_port = FlowElement.from_dict({
+            'name': 'test-input-port',
+            'type': 'input_port'
+        })
+        input_port.id = 'test-id'
+        input_port.parent_id = 'test-parent-id'
+        self.assertEqual(input_port.id, 'test-id')
+        self.assertEqual(input_port.parent_id, 'test-parent-id')
+        self.assertRaisesRegex(FlowLibException, "^Attempted to change readonly attribute.*", setattr, input_port, 'id', 'other-id')
+        self.assertRaisesRegex(FlowLibException, "^Attempted to change readonly attribute.*", setattr, input_port, 'parent_id', 'other-id')
+
+        output_port = FlowElement.from_dict({
+            'name': 'test-output-port',
+            'type': 'output_port'
+        })
+        output_port.id = ''
+        self.assertRaisesRegex(FlowLibException, "^Attempted to change readonly attribute.*", setattr, output_port, 'id', 'other-id')
+
+    def test_flow_element_validate_many(self):
+        valid = {
+            'name': 'test-input-port',
+            'type': 'input_port'
+        }
+        invalid_type = {
+            'name': 'test',
+            'type': 'invalid-type'
+        }
+        FlowElement.validate_many([valid])
+        self.assertRaisesRegex(FlowLibException, "^Element 'type' field must be one of .*", FlowElement.validate_many, [valid, invalid_type])
+        self.assertIsInstance(FlowElement.from_validated_dict(valid), InputPort)